@@ -1,27 +1,34 @@
-import base64
+import hashlib
 import os
-import io
-import zipfile
+import shutil
+import threading
 from io import BytesIO
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
-from typing import Dict, Any, Optional
+from typing import Optional
 from datetime import datetime
+from time import strftime, localtime, time_ns
+from urllib.parse import quote
 
 from flask import (
     Flask, render_template, request, redirect, url_for,
-    flash, send_file, send_from_directory, abort, Response
+    flash, send_file, send_from_directory, abort, Response,
+    make_response, get_flashed_messages
 )
 
 from werkzeug.utils import secure_filename
+from flask_compress import Compress
 
-from mutagen.id3 import (
-    ID3, ID3NoHeaderError,
-    TIT2, TPE1, TPE2, TALB, TCOM, TCON, TDRC, TYER, TRCK, TPOS,
-    COMM, USLT, APIC
-)
+from mutagen.id3 import ID3, APIC
 from mutagen import MutagenError
-# from mutagen.mp3 import MP3
+
+from id3_helpers import (
+    COVER_TYPE_MAP, TAG_FIELDS, id3_padding,
+    load_id3, load_id3_min, get_text, get_common, render_edit_context,
+    set_field, get_cover, probe_cover, apics_by_type, set_apics,
+    remove_cover, human_size,
+)
 
 # ---------------- Config ----------------
 
@@ -35,7 +42,26 @@ MIME_BY_EXT = {
     ".webp": "image/webp",
     ".bmp": "image/bmp",
 }
-COVER_TYPE_MAP = {"front": 3, "back": 4}
+
+class ZipChunkSink:
+    """
+    Write-only, non-seekable file object for zipfile.ZipFile.
+    Output is buffered until drain() so a generator can stream the archive.
+    """
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks.clear()
+        return out
 
 def create_app():
     app = Flask(__name__, instance_relative_config=True)
@@ -73,210 +99,172 @@ def create_app():
         UPLOAD_FOLDER=str(Path(app.instance_path) / "uploads"),
         SAVE_AS_V23=True,  # save as ID3v2.3 for max compatibility
         PREFERRED_URL_SCHEME="https",
+        # Let the front-end server send MP3 downloads (off by default: without
+        # support in front, downloads would come back empty).
+        # Apache + mod_xsendfile: USE_X_SENDFILE=1
+        # nginx: X_ACCEL_REDIRECT_PREFIX=/protected_uploads/ (an internal location)
+        USE_X_SENDFILE=os.environ.get("USE_X_SENDFILE", "") == "1",
+        X_ACCEL_REDIRECT_PREFIX=os.environ.get("X_ACCEL_REDIRECT_PREFIX", ""),
+        # compress text only; covers, MP3s and ZIPs are already compressed
+        COMPRESS_MIMETYPES=["text/html", "text/css", "application/javascript", "application/json"],
+        # Flask-Compress prefers zstd, then br, gzip, deflate, each with its
+        # own level setting; pin them all to cheap, fast levels
+        COMPRESS_ZSTD_LEVEL=3,
+        COMPRESS_BR_LEVEL=4,
+        COMPRESS_LEVEL=4,  # gzip
+        COMPRESS_DEFLATE_LEVEL=4,
     )
+    Compress(app)
     
     # App metadata / version
     app.config["APP_VERSION"] = os.environ.get("APP_VERSION", "v0.1-dev")
 
+    # resolved once; routes build plain string paths from it
+    UPLOAD_ROOT_STR = os.path.abspath(app.config["UPLOAD_FOLDER"])
+    UPLOAD_ROOT = Path(UPLOAD_ROOT_STR)
+
     # ensure folders
     Path(app.instance_path).mkdir(parents=True, exist_ok=True)
-    Path(app.config["UPLOAD_FOLDER"]).mkdir(parents=True, exist_ok=True)
+    UPLOAD_ROOT.mkdir(parents=True, exist_ok=True)
 
     # ------------ Helpers ------------
 
-    def load_id3(file_path: Path) -> ID3:
-        try:
-            return ID3(file_path)
-        except ID3NoHeaderError:
-            return ID3()
+    def upload_path(filename: str) -> Optional[str]:
+        """
+        Join a user-supplied name onto the upload root.
+        Returns None for names that would escape it ('../x', '/etc/x'), so
+        callers can bail out before touching the filesystem. normpath keeps
+        this purely lexical (no syscalls, symlinked uploads still work).
+        """
+        p = os.path.normpath(os.path.join(UPLOAD_ROOT_STR, filename))
+        if os.path.commonpath([p, UPLOAD_ROOT_STR]) != UPLOAD_ROOT_STR:
+            return None
+        return p
 
-    def save_id3(file_path: Path, tags: ID3) -> None:
+    def save_id3(file_path: str, tags: ID3) -> None:
         if app.config.get("SAVE_AS_V23", True):
-            tags.save(file_path, v2_version=3)
+            tags.save(file_path, v2_version=3, padding=id3_padding)
         else:
-            tags.save(file_path)
-
-    def get_text(tags: ID3, key: str) -> str:
-        f = tags.get(key)
-        return (f.text[0] if (f and hasattr(f, "text") and f.text) else "")
-
-    def get_common(tags: ID3) -> Dict[str, Any]:
-        # comments / lyrics (English slot, empty desc)
-        comment = ""
-        for f in tags.getall("COMM"):
-            if f.lang.lower() in ("eng", "en") and f.desc == "":
-                comment = f.text or ""
-                break
-
-        lyrics = ""
-        for f in tags.getall("USLT"):
-            if f.lang.lower() in ("eng", "en") and f.desc == "":
-                lyrics = f.text or ""
-                break
-
-        # date: prefer TDRC, fallback TYER
-        date = get_text(tags, "TDRC") or get_text(tags, "TYER")
-
-        return {
-            "title":       get_text(tags, "TIT2"),
-            "artist":      get_text(tags, "TPE1"),
-            "album":       get_text(tags, "TALB"),
-            "albumartist": get_text(tags, "TPE2"),
-            "composer":    get_text(tags, "TCOM"),
-            "genre":       get_text(tags, "TCON"),
-            "date":        date,
-            "track":       get_text(tags, "TRCK"),
-            "disc":        get_text(tags, "TPOS"),
-            "comment":     comment,
-            "lyrics":      lyrics,
-        }
-    
-    def safe_get_title_artist(file_path: Path) -> dict:
+            tags.save(file_path, padding=id3_padding)
+        # Tags are written in place, which changes the file's position in
+        # the newest-first order without touching the directory mtime.
+        # Bump it ourselves so the listing cache in every worker process
+        # sees the change; +1 ns guards against coarse clock ticks.
+        try:
+            dir_st = os.stat(UPLOAD_ROOT_STR)
+            os.utime(UPLOAD_ROOT_STR, ns=(dir_st.st_atime_ns, max(time_ns(), dir_st.st_mtime_ns + 1)))
+        except OSError:
+            # e.g. the directory isn't owned by the worker user; the tags are
+            # already saved, so at least refresh this process's listing
+            _dir_cache["mtime"] = -1
+
+    # Explore metadata keyed by (path, mtime_ns, size), so any write to the
+    # file (save, upload, delete + re-upload) naturally invalidates the entry.
+    # Plain dict so list_uploaded_files() can pick out the misses; writes go
+    # through the lock, oldest entries are dropped past META_CACHE_MAX.
+    META_CACHE_MAX = 4096
+    _meta_cache: dict = {}
+    _meta_cache_lock = threading.Lock()
+
+    def read_meta(path_str: str) -> dict:
         """
-        Return {'title': ..., 'artist': ...} for display in Explore.
-        Never throws; falls back to '' if unreadable.
+        Return {'title', 'artist', 'has_cover'} for one file, parsing ID3 once.
         """
         try:
-            tags = load_id3(file_path)
-            meta = get_common(tags)
-            return {
-                "title": meta.get("title", "") or "",
-                "artist": meta.get("artist", "") or "",
-            }
+            tags = load_id3_min(path_str)
         except Exception:
-            return {"title": "", "artist": ""}
+            return {"title": "", "artist": "", "has_cover": False}
+
+        title = get_text(tags, "TIT2")
+        artist = get_text(tags, "TPE1")
 
-    def safe_get_front_cover_data_url(file_path: Path) -> str:
-        """
-        Return a base64 data URL for the front cover, or '' if none.
-        We don't resize here; just use browser CSS to keep it small.
-        """
         try:
-            tags = load_id3(file_path)
-            cover = get_cover_b64(tags, "front")
-            if cover and "data_url" in cover:
-                return cover["data_url"]
+            has_cover = probe_cover(tags, "front") is not None
         except Exception:
-            pass
-        return ""
-
-    def set_field(tags: ID3, field: str, value: str) -> None:
-        f = field.lower()
-        if f == "title":
-            tags["TIT2"] = TIT2(encoding=3, text=value)
-        elif f == "artist":
-            tags["TPE1"] = TPE1(encoding=3, text=value)
-        elif f == "album":
-            tags["TALB"] = TALB(encoding=3, text=value)
-        elif f == "albumartist":
-            tags["TPE2"] = TPE2(encoding=3, text=value)
-        elif f == "composer":
-            tags["TCOM"] = TCOM(encoding=3, text=value)
-        elif f == "genre":
-            tags["TCON"] = TCON(encoding=3, text=value)
-        elif f == "date":
-            tags["TDRC"] = TDRC(encoding=3, text=value)
-            if value.isdigit() and len(value) == 4:
-                tags["TYER"] = TYER(encoding=3, text=value)
-        elif f == "track":
-            tags["TRCK"] = TRCK(encoding=3, text=value)
-        elif f == "disc":
-            tags["TPOS"] = TPOS(encoding=3, text=value)
-        elif f == "comment":
-            tags.add(COMM(encoding=3, lang="eng", desc="", text=value))
-        elif f == "lyrics":
-            tags.add(USLT(encoding=3, lang="eng", desc="", text=value))
+            has_cover = False
+
+        return {"title": title, "artist": artist, "has_cover": has_cover}
 
     def infer_mime(image_name: str) -> str:
         ext = Path(image_name).suffix.lower()
         return MIME_BY_EXT.get(ext, "image/jpeg")
 
-    def get_cover_b64(tags: ID3, kind: str = "front") -> Optional[Dict[str, str]]:
-        ctype = COVER_TYPE_MAP.get(kind, 3)
-        for apic in tags.getall("APIC"):
-            if apic.type == ctype:
-                b64 = base64.b64encode(apic.data).decode("ascii")
-                return {"mime": apic.mime, "data_url": f"data:{apic.mime};base64,{b64}"}
-        return None
-
-    def remove_cover(tags: ID3, kind: Optional[str]) -> int:
-        if kind in (None, "all"):
-            n = len(tags.getall("APIC"))
-            tags.delall("APIC")
-            return n
-        ctype = COVER_TYPE_MAP.get(kind, 3)
-        apics = tags.getall("APIC")
-        tags.delall("APIC")
-        kept = []
-        removed = 0
-        for apic in apics:
-            if apic.type == ctype:
-                removed += 1
-            else:
-                kept.append(apic)
-        for k in kept:
-            tags.add(k)
-        return removed
-
-    def human_size(num_bytes: int) -> str:
-        # Always work in float for division, but only after checking thresholds.
-        if num_bytes < 1024:
-            return f"{num_bytes} bytes"
-        kb = num_bytes / 1024.0
-        if kb < 1024:
-            return f"{kb:.1f} KB"
-        mb = kb / 1024.0
-        if mb < 1024:
-            return f"{mb:.1f} MB"
-        gb = mb / 1024.0
-        if gb < 1024:
-            return f"{gb:.2f} GB"
-        tb = gb / 1024.0
-        return f"{tb:.2f} TB"
-
+    def cover_url(filename: str, kind: str, mtime_ns: int) -> str:
+        # The file mtime is only there to bust the browser cache once the
+        # tags change, the route itself ignores it.
+        return url_for("cover_img", filename=filename, kind=kind, v=mtime_ns)
 
     def list_uploaded_files(upload_folder: str):
         items = []
-        root = Path(upload_folder)
-        if not root.exists():
+        if not os.path.isdir(upload_folder):
             return items
 
-        for p in sorted(root.iterdir(), key=lambda x: x.stat().st_mtime, reverse=True):
-            if not p.is_file():
-                continue
-            if p.suffix.lower() != ".mp3":
-                continue
+        # DirEntry.stat() is memoized, so sort + display share one stat per file
+        with os.scandir(upload_folder) as it:
+            entries = [e for e in it if e.is_file() and e.name.lower().endswith(".mp3")]
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        if not entries:
+            return items
 
-            st = p.stat()
-            ta = safe_get_title_artist(p)
-            thumb_url = safe_get_front_cover_data_url(p)
+        keys = [(e.path, e.stat().st_mtime_ns, e.stat().st_size) for e in entries]
+        metas = [_meta_cache.get(k) for k in keys]
+        misses = [i for i, meta in enumerate(metas) if meta is None]
+
+        # cold reads are independent file opens, so overlap them; a fully
+        # warm render never starts the pool
+        if misses:
+            with ThreadPoolExecutor(max_workers=min(16, len(misses))) as ex:
+                fresh = list(ex.map(read_meta, [keys[i][0] for i in misses]))
+            with _meta_cache_lock:
+                for i, meta in zip(misses, fresh):
+                    metas[i] = _meta_cache[keys[i]] = meta
+                while len(_meta_cache) > META_CACHE_MAX:
+                    del _meta_cache[next(iter(_meta_cache))]
+
+        for e, meta in zip(entries, metas):
+            st = e.stat()
+            thumb_url = cover_url(e.name, "front", st.st_mtime_ns) if meta["has_cover"] else ""
 
             items.append({
-                "name": p.name,
+                "name": e.name,
                 "size_human": human_size(st.st_size),
-                "mtime_human": datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d %H:%M"),
-                "title": ta["title"],
-                "artist": ta["artist"],
+                "mtime_human": strftime("%Y-%m-%d %H:%M", localtime(st.st_mtime)),
+                "title": meta["title"],
+                "artist": meta["artist"],
                 "thumb": thumb_url,  # '' if no cover
             })
 
         return items
     
+    # newest-first .mp3 names (+ name -> position), valid while the upload
+    # dir mtime is unchanged. Stored as one tuple so readers never see a
+    # names list from one scan paired with the index map of another.
+    _dir_cache = {"mtime": -1, "listing": ([], {})}
+
     def get_sorted_mp3s(upload_folder: str):
         """
-        Return a list of Path objects for .mp3 files in upload_folder,
-        sorted newest-first (same logic we used in list_uploaded_files()).
+        Return (names, {name: index}) for .mp3 files in upload_folder, sorted
+        newest-first (same logic we used in list_uploaded_files()).
+        Cached until the directory mtime changes (add/remove/rename, or
+        save_id3() bumping it after an in-place tag write).
         """
-        root = Path(upload_folder)
-        if not root.exists():
-            return []
-        files = []
-        for p in root.iterdir():
-            if p.is_file() and p.suffix.lower() == ".mp3":
-                files.append(p)
+        try:
+            dir_mtime = os.stat(upload_folder).st_mtime_ns
+        except FileNotFoundError:
+            return [], {}
+        if dir_mtime == _dir_cache["mtime"]:
+            return _dir_cache["listing"]
+
+        with os.scandir(upload_folder) as it:
+            entries = [e for e in it if e.is_file() and e.name.lower().endswith(".mp3")]
         # sort by mtime desc (newest first)
-        files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-        return files
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        names = [e.name for e in entries]
+        idx_map = {name: i for i, name in enumerate(names)}
+
+        _dir_cache["listing"] = (names, idx_map)
+        _dir_cache["mtime"] = dir_mtime
+        return names, idx_map
 
 
     def get_neighbors(upload_folder: str, current_name: str):
@@ -286,20 +274,37 @@ def create_app():
         'prev' means the one that appears just before current in the sort order
         (i.e. more recent), 'next' means just after.
         """
-        files = get_sorted_mp3s(upload_folder)
-        names = [p.name for p in files]
+        names, idx_map = get_sorted_mp3s(upload_folder)
 
-        if current_name not in names:
+        idx = idx_map.get(current_name)
+        if idx is None:
             return (None, None)
 
-        idx = names.index(current_name)
-
         prev_name = names[idx - 1] if idx - 1 >= 0 else None
         next_name = names[idx + 1] if idx + 1 < len(names) else None
 
         return (prev_name, next_name)
 
 
+    def render_edit(filename, file_path, mtime_ns, prev_name, next_name):
+        ctx = render_edit_context(load_id3(file_path))
+        cover_front = cover_back = None
+        if ctx["front"] is not None:
+            cover_front = {"mime": ctx["front"], "url": cover_url(filename, "front", mtime_ns)}
+        if ctx["back"] is not None:
+            cover_back = {"mime": ctx["back"], "url": cover_url(filename, "back", mtime_ns)}
+
+        return render_template(
+            "edit.html",
+            filename=filename,
+            common=ctx["common"],
+            cover_front=cover_front,
+            cover_back=cover_back,
+            prev_name=prev_name,
+            next_name=next_name,
+        )
+
+
     # --------------- Routes ---------------
 
     @app.route("/", methods=["GET", "POST"])
@@ -320,8 +325,10 @@ def create_app():
             ext = Path(fname).suffix.lower()
             unique = datetime.now().strftime("%Y%m%d-%H%M%S")
             fname = f"{stem}-{unique}{ext}"
-            dest = Path(app.config["UPLOAD_FOLDER"]) / fname
-            f.save(dest)
+            dest = upload_path(fname)
+            # same as f.save(), but with 1 MiB copy chunks instead of 16 KiB
+            with open(dest, "wb") as out:
+                shutil.copyfileobj(f.stream, out, length=1 << 20)
             flash("File uploaded.", "ok")
             return redirect(url_for("edit", filename=fname))
         return render_template("index.html")
@@ -329,41 +336,66 @@ def create_app():
     @app.route("/edit/<path:filename>", methods=["GET"])
     @require_auth
     def edit(filename):
-        file_path = Path(app.config["UPLOAD_FOLDER"]) / filename
-        if not file_path.exists():
+        file_path = upload_path(filename)
+        if file_path is None or not os.path.isfile(file_path):
             abort(404)
 
-        tags = load_id3(file_path)
-        common = get_common(tags)
-        cover_front = get_cover_b64(tags, "front")
-        cover_back = get_cover_b64(tags, "back")
-
-        prev_name, next_name = get_neighbors(app.config["UPLOAD_FOLDER"], filename)
-
-        return render_template(
-            "edit.html",
-            filename=filename,
-            common=common,
-            cover_front=cover_front,
-            cover_back=cover_back,
-            prev_name=prev_name,
-            next_name=next_name,
-        )
+        st = os.stat(file_path)
+        mtime_ns = st.st_mtime_ns
+        prev_name, next_name = get_neighbors(UPLOAD_ROOT_STR, filename)
+
+        # A page carrying flash messages is one-off: render it in full and
+        # keep it out of the browser cache entirely, otherwise a later
+        # revalidation could 304 back to the cached message.
+        # (get_flashed_messages() caches per request, so base.html still
+        # gets the same messages)
+        if get_flashed_messages():
+            resp = make_response(render_edit(filename, file_path, mtime_ns, prev_name, next_name))
+            resp.cache_control.no_store = True
+            return resp
+
+        # Otherwise the page only depends on the file itself, its neighbours
+        # and the app version, so a matching ETag lets us skip the ID3 parse
+        # and the render.
+        etag = hashlib.blake2b(
+            f"{mtime_ns}:{st.st_size}:{prev_name}:{next_name}:{app.config['APP_VERSION']}".encode(),
+            digest_size=16,
+        ).hexdigest()
+        if request.if_none_match.contains_weak(etag):
+            resp = Response(status=304)
+        else:
+            resp = make_response(render_edit(filename, file_path, mtime_ns, prev_name, next_name))
+        resp.set_etag(etag, weak=True)
+        # no-cache = always revalidate, which is cheap now
+        resp.cache_control.private = True
+        resp.cache_control.no_cache = True
+        return resp
 
 
     @app.post("/update/<path:filename>")
     @require_auth
     def update(filename):
-        file_path = Path(app.config["UPLOAD_FOLDER"]) / filename
-        if not file_path.exists():
+        file_path = upload_path(filename)
+        if file_path is None or not os.path.isfile(file_path):
             abort(404)
         tags = load_id3(file_path)
+        before = get_common(tags)
+
+        # only touch frames whose value actually differs, and skip the
+        # write (which may rewrite the whole MP3) when nothing does
+        changed = {}
+        for fkey, val in request.form.items():
+            if fkey in TAG_FIELDS:
+                val = val.strip()
+                if before.get(fkey, "") != val:
+                    changed[fkey] = val
+
+        if not changed:
+            flash("No changes.", "ok")
+            return redirect(url_for("edit", filename=filename))
 
-        fields = ["title","artist","album","albumartist","composer","genre","date","track","disc","comment","lyrics"]
-        for fkey in fields:
-            val = request.form.get(fkey, "")
-            if val is not None:
-                set_field(tags, fkey, val.strip())
+        for fkey, val in changed.items():
+            set_field(tags, fkey, val)
 
         try:
             save_id3(file_path, tags)
@@ -376,8 +408,8 @@ def create_app():
     @app.post("/cover/<path:filename>/add")
     @require_auth
     def add_cover(filename):
-        file_path = Path(app.config["UPLOAD_FOLDER"]) / filename
-        if not file_path.exists():
+        file_path = upload_path(filename)
+        if file_path is None or not os.path.isfile(file_path):
             abort(404)
         tags = load_id3(file_path)
 
@@ -396,14 +428,10 @@ def create_app():
         mime = MIME_BY_EXT.get(ext, "image/jpeg")
         ctype = COVER_TYPE_MAP.get(kind, 3)
 
-        # remove existing same type, then add
-        apics = tags.getall("APIC")
-        tags.delall("APIC")
-        # keep others
-        for apic in apics:
-            if apic.type != ctype:
-                tags.add(apic)
-        tags.add(APIC(encoding=3, mime=mime, type=ctype, desc="", data=data))
+        # replace existing same type, keep others
+        by_type = apics_by_type(tags)
+        by_type[ctype] = [APIC(encoding=3, mime=mime, type=ctype, desc="", data=data)]
+        set_apics(tags, by_type)
 
         save_id3(file_path, tags)
         flash(f"{kind.capitalize()} cover updated.", "ok")
@@ -412,43 +440,83 @@ def create_app():
     @app.post("/cover/<path:filename>/remove")
     @require_auth
     def remove_cover_route(filename):
-        file_path = Path(app.config["UPLOAD_FOLDER"]) / filename
-        if not file_path.exists():
+        file_path = upload_path(filename)
+        if file_path is None or not os.path.isfile(file_path):
             abort(404)
         kind = request.form.get("kind")  # "front", "back", or "all"
         tags = load_id3(file_path)
         n = remove_cover(tags, kind)
-        save_id3(file_path, tags)
+        if n:
+            save_id3(file_path, tags)
         flash(f"Removed {n} cover image(s).", "ok")
         return redirect(url_for("edit", filename=filename))
 
+    @app.get("/cover/<path:filename>/<kind>.img")
+    @require_auth
+    def cover_img(filename, kind):
+        # Serve an embedded cover as a plain image so the browser can cache it
+        if kind not in COVER_TYPE_MAP:
+            abort(404)
+        file_path = upload_path(filename)
+        if file_path is None or not os.path.isfile(file_path):
+            abort(404)
+        tags = load_id3(file_path)
+        apic = get_cover(tags, kind)
+        if apic is None:
+            abort(404)
+
+        etag = hashlib.blake2b(apic.data, digest_size=16).hexdigest()
+        resp = send_file(
+            BytesIO(apic.data),
+            mimetype=apic.mime or "application/octet-stream",
+            etag=etag,
+            conditional=True,
+            max_age=31536000,
+        )
+        # private, not public: these sit behind Basic Auth
+        resp.cache_control.public = False
+        resp.cache_control.private = True
+        resp.cache_control.immutable = True
+        return resp
+
     @app.get("/cover/<path:filename>/download")
     @require_auth
     def download_cover(filename):
         # Download the front cover by default
-        file_path = Path(app.config["UPLOAD_FOLDER"]) / filename
-        if not file_path.exists():
+        file_path = upload_path(filename)
+        if file_path is None or not os.path.isfile(file_path):
             abort(404)
         tags = load_id3(file_path)
+        by_type = apics_by_type(tags)
         # try front first, then back
         for kind in ("front", "back"):
-            ctype = COVER_TYPE_MAP[kind]
-            for apic in tags.getall("APIC"):
-                if apic.type == ctype:
-                    return send_file(
-                        BytesIO(apic.data),
-                        mimetype=apic.mime or "application/octet-stream",
-                        as_attachment=True,
-                        download_name=f"{Path(filename).stem}-{kind}.jpg"
-                    )
+            for apic in by_type.get(COVER_TYPE_MAP[kind], ()):
+                return send_file(
+                    BytesIO(apic.data),
+                    mimetype=apic.mime or "application/octet-stream",
+                    as_attachment=True,
+                    download_name=f"{Path(filename).stem}-{kind}.jpg"
+                )
         flash("No cover image found to download.", "error")
         return redirect(url_for("edit", filename=filename))
     
     @app.route("/download/<path:filename>")
     @require_auth
     def download_updated(filename):
+        accel_prefix = app.config.get("X_ACCEL_REDIRECT_PREFIX", "")
+        if accel_prefix:
+            file_path = upload_path(filename)
+            if file_path is None or not os.path.isfile(file_path):
+                abort(404)
+            rel = os.path.relpath(file_path, UPLOAD_ROOT_STR).replace(os.sep, "/")
+            return Response(headers={
+                "X-Accel-Redirect": accel_prefix.rstrip("/") + "/" + quote(rel),
+                "Content-Type": "audio/mpeg",
+                "Content-Disposition": f'attachment; filename="{os.path.basename(rel)}"',
+            })
+        # honours USE_X_SENDFILE on its own
         return send_from_directory(
-            app.config["UPLOAD_FOLDER"],
+            UPLOAD_ROOT_STR,
             filename,
             as_attachment=True
         )
@@ -463,18 +531,18 @@ def create_app():
     @app.get("/explore")
     @require_auth
     def explore():
-        files = list_uploaded_files(app.config["UPLOAD_FOLDER"])
+        files = list_uploaded_files(UPLOAD_ROOT_STR)
         return render_template("explore.html", files=files)
     
     @app.post("/delete/<path:filename>")
     def delete_file(filename):
-        file_path = Path(app.config["UPLOAD_FOLDER"]) / filename
-        if not file_path.exists():
+        file_path = upload_path(filename)
+        if file_path is None or not os.path.isfile(file_path):
             flash("File not found.", "error")
             return redirect(url_for("explore"))
 
         try:
-            file_path.unlink()
+            os.remove(file_path)
             flash(f"Deleted {filename}", "ok")
         except Exception as e:
             flash(f"Could not delete {filename}: {e}", "error")
@@ -494,10 +562,10 @@ def create_app():
         failed = []
 
         for filename in filenames:
-            file_path = Path(app.config["UPLOAD_FOLDER"]) / filename
+            file_path = upload_path(filename)
             try:
-                if file_path.exists() and file_path.is_file():
-                    file_path.unlink()
+                if file_path is not None and os.path.isfile(file_path):
+                    os.remove(file_path)
                     deleted.append(filename)
                 else:
                     failed.append(filename)
@@ -520,29 +588,41 @@ def create_app():
             flash("No files selected.", "error")
             return redirect(url_for("explore"))
 
-        # We'll build the zip in memory
-        mem_zip = io.BytesIO()
-        with zipfile.ZipFile(mem_zip, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for filename in filenames:
-                file_path = Path(app.config["UPLOAD_FOLDER"]) / filename
-                # only add real, readable files
-                if file_path.exists() and file_path.is_file():
+        # only add real, readable files
+        files = []
+        for filename in filenames:
+            file_path = upload_path(filename)
+            if file_path is not None and os.path.isfile(file_path):
+                files.append((filename, file_path))
+
+        # only needed here, so keep it off the worker's import path
+        import zipfile
+
+        def generate():
+            # MP3 audio is already compressed, so store instead of deflate.
+            # The sink is not seekable, so zipfile writes data descriptors and
+            # only one 1 MiB chunk is held in memory at a time.
+            sink = ZipChunkSink()
+            with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as zf:
+                for filename, file_path in files:
                     # arcname = filename inside the zip
-                    zf.write(file_path, arcname=filename)
-
-        mem_zip.seek(0)
+                    zinfo = zipfile.ZipInfo.from_file(file_path, arcname=filename)
+                    with open(file_path, "rb") as src, zf.open(zinfo, "w") as dst:
+                        while chunk := src.read(1 << 20):
+                            dst.write(chunk)
+                            yield sink.drain()
+                    yield sink.drain()
+            yield sink.drain()
 
         # Build a nice zip filename, like export-2025-10-28_22-41.zip
-        from datetime import datetime
         stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         zip_name = f"mp3-export-{stamp}.zip"
 
         # return as attachment
-        return send_file(
-            mem_zip,
+        return Response(
+            generate(),
             mimetype="application/zip",
-            as_attachment=True,
-            download_name=zip_name
+            headers={"Content-Disposition": f'attachment; filename="{zip_name}"'},
         )
     
     @app.context_processor
@@ -0,0 +1,203 @@
+"""
+Pure ID3 helpers used by the routes in app_main.
+
+Nothing in here touches Flask or the app config, so the module can be
+compiled with mypyc for a faster parse/format path:
+
+    pip install mypy
+    mypyc id3_helpers.py
+
+Python picks up the resulting .so automatically; without it this plain
+.py file is used, so deployment does not depend on the build.
+"""
+from typing import Any, Dict, List, Optional, Set
+
+from mutagen import PaddingInfo
+from mutagen.id3 import (
+    ID3, ID3NoHeaderError,
+    TIT2, TPE1, TPE2, TALB, TCOM, TCON, TDRC, TYER, TRCK, TPOS,
+    COMM, USLT, APIC, TT2, TP1, PIC
+)
+
+COVER_TYPE_MAP = {"front": 3, "back": 4}
+
+# form field -> (frame id, frame class) for plain single-value text frames
+SIMPLE_TEXT_FRAMES = {
+    "title":       ("TIT2", TIT2),
+    "artist":      ("TPE1", TPE1),
+    "album":       ("TALB", TALB),
+    "albumartist": ("TPE2", TPE2),
+    "composer":    ("TCOM", TCOM),
+    "genre":       ("TCON", TCON),
+    "track":       ("TRCK", TRCK),
+    "disc":        ("TPOS", TPOS),
+}
+# form field -> (frame class, language) for lang/desc keyed frames
+LANG_FRAMES = {
+    "comment": (COMM, "eng"),
+    "lyrics":  (USLT, "eng"),
+}
+TAG_FIELDS = frozenset(SIMPLE_TEXT_FRAMES) | frozenset(LANG_FRAMES) | {"date"}
+# reverse lookups for walking a tag's frames once
+TEXT_FRAME_FIELDS = {fid: field for field, (fid, _cls) in SIMPLE_TEXT_FRAMES.items()}
+LANG_FRAME_FIELDS = {cls.__name__: field for field, (cls, _lang) in LANG_FRAMES.items()}
+COVER_KIND_BY_TYPE = {ctype: kind for kind, ctype in COVER_TYPE_MAP.items()}
+# the only frames Explore needs; everything else is kept as raw bytes.
+# v2.2 names are listed too so translate=True can upgrade them.
+LISTING_FRAMES = {
+    "TIT2": TIT2, "TPE1": TPE1, "APIC": APIC,
+    "TT2": TT2, "TP1": TP1, "PIC": PIC,
+}
+
+def id3_padding(info: PaddingInfo) -> int:
+    """
+    mutagen padding callback. If the new tag fits in the existing padding,
+    keep it as is so only the header is rewritten in place; when it has to
+    grow, leave at least 4 KiB spare so the next edits fit again.
+    """
+    if info.padding >= 0:
+        return info.padding
+    return max(4096, info.get_default_padding())
+
+
+def load_id3(file_path: str) -> ID3:
+    try:
+        return ID3(file_path)
+    except ID3NoHeaderError:
+        return ID3()
+
+
+def load_id3_min(file_path: str) -> ID3:
+    """
+    Cheap read for Explore: skip the ID3v1 footer and only decode the
+    frames in LISTING_FRAMES, leaving comments, lyrics etc. unparsed.
+    """
+    tags = ID3()
+    try:
+        tags.load(file_path, known_frames=LISTING_FRAMES, load_v1=False)
+    except ID3NoHeaderError:
+        return ID3()
+    return tags
+
+
+def get_text(tags: ID3, key: str) -> str:
+    f = tags.get(key)
+    # str() so TDRC timestamps compare equal to the submitted form text
+    return (str(f.text[0]) if (f and hasattr(f, "text") and f.text) else "")
+
+
+def render_edit_context(tags: ID3) -> Dict[str, Any]:
+    """
+    Walk the frames once and collect everything the Edit page needs:
+    {'common': {...fields...}, 'front': mime or None, 'back': mime or None}
+    """
+    common: Dict[str, str] = dict.fromkeys(
+        ("title", "artist", "album", "albumartist", "composer", "genre",
+         "date", "track", "disc", "comment", "lyrics"), "")
+    tdrc = tyer = ""
+    covers: Dict[str, Optional[str]] = dict.fromkeys(COVER_TYPE_MAP)
+    seen_lang: Set[str] = set()
+
+    for frame in tags.values():
+        fid = frame.FrameID
+        field = TEXT_FRAME_FIELDS.get(fid)
+        if field is not None:
+            common[field] = str(frame.text[0]) if frame.text else ""
+        elif fid == "TDRC":
+            tdrc = str(frame.text[0]) if frame.text else ""
+        elif fid == "TYER":
+            tyer = str(frame.text[0]) if frame.text else ""
+        elif fid in LANG_FRAME_FIELDS:
+            # comments / lyrics: first English slot with an empty desc
+            field = LANG_FRAME_FIELDS[fid]
+            if field not in seen_lang and frame.lang.lower() in ("eng", "en") and frame.desc == "":
+                seen_lang.add(field)
+                # COMM holds a list of strings, USLT a single string
+                if fid == "COMM":
+                    common[field] = frame.text[0] if frame.text else ""
+                else:
+                    common[field] = frame.text or ""
+        elif fid == "APIC":
+            kind = COVER_KIND_BY_TYPE.get(frame.type)
+            if kind is not None and covers[kind] is None:
+                covers[kind] = frame.mime
+
+    # date: prefer TDRC, fallback TYER
+    common["date"] = tdrc or tyer
+    return {"common": common, **covers}
+
+
+def get_common(tags: ID3) -> Dict[str, Any]:
+    return render_edit_context(tags)["common"]
+
+
+def set_field(tags: ID3, field: str, value: str) -> None:
+    simple = SIMPLE_TEXT_FRAMES.get(field)
+    if simple is not None:
+        key, cls = simple
+        tags[key] = cls(encoding=3, text=value)
+    elif field == "date":
+        tags["TDRC"] = TDRC(encoding=3, text=value)
+        if value.isdigit() and len(value) == 4:
+            tags["TYER"] = TYER(encoding=3, text=value)
+    elif field in LANG_FRAMES:
+        lang_cls, lang = LANG_FRAMES[field]
+        tags.add(lang_cls(encoding=3, lang=lang, desc="", text=value))
+
+
+def get_cover(tags: ID3, kind: str = "front") -> Optional[APIC]:
+    ctype = COVER_TYPE_MAP.get(kind, 3)
+    for apic in tags.getall("APIC"):
+        if apic.type == ctype:
+            return apic
+    return None
+
+
+def probe_cover(tags: ID3, kind: str = "front") -> Optional[str]:
+    # mime of the matching cover, or None; never touches the image bytes
+    ctype = COVER_TYPE_MAP.get(kind, 3)
+    return next((a.mime for a in tags.getall("APIC") if a.type == ctype), None)
+
+
+def apics_by_type(tags: ID3) -> Dict[int, List[APIC]]:
+    # one pass over the APIC frames, grouped by picture type
+    by_type: Dict[int, List[APIC]] = {}
+    for apic in tags.getall("APIC"):
+        by_type.setdefault(apic.type, []).append(apic)
+    return by_type
+
+
+def set_apics(tags: ID3, by_type: Dict[int, List[APIC]]) -> None:
+    tags.delall("APIC")
+    for apics in by_type.values():
+        for apic in apics:
+            tags.add(apic)
+
+
+def remove_cover(tags: ID3, kind: Optional[str]) -> int:
+    if kind in (None, "all"):
+        n = len(tags.getall("APIC"))
+        tags.delall("APIC")
+        return n
+    by_type = apics_by_type(tags)
+    removed = by_type.pop(COVER_TYPE_MAP.get(kind, 3), [])
+    if removed:
+        set_apics(tags, by_type)
+    return len(removed)
+
+
+def human_size(num_bytes: int) -> str:
+    # Always work in float for division, but only after checking thresholds.
+    if num_bytes < 1024:
+        return f"{num_bytes} bytes"
+    kb = num_bytes / 1024.0
+    if kb < 1024:
+        return f"{kb:.1f} KB"
+    mb = kb / 1024.0
+    if mb < 1024:
+        return f"{mb:.1f} MB"
+    gb = mb / 1024.0
+    if gb < 1024:
+        return f"{gb:.2f} GB"
+    tb = gb / 1024.0
+    return f"{tb:.2f} TB"